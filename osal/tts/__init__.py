@@ -1,50 +1,58 @@
+import wave
 import numpy as np
-import scipy.io.wavfile as wavfile
-from typing import Generator, Optional, List, Tuple
+from typing import Generator, Iterable, Optional, Tuple
 from numpy.typing import NDArray
 
 from .orpheus_cpp import OrpheusCpp
+from .orpheus_ct2 import OrpheusCT2
 from .utils import TTSOptions
 from .models import MODELS_DICT
 
 __all__ = [
     "OrpheusCpp",
+    "OrpheusCT2",
+    "TTSOptions",
     "get_supported_languages",
     "get_available_voices",
     "get_default_male_voice",
     "get_default_female_voice",
-    "save_wav"
+    "save_wav",
+    "save_wav_stream"
 ]
 
+_SUPPORTED_LANGS = tuple(MODELS_DICT.keys())
+_LANG_SET = frozenset(_SUPPORTED_LANGS)
+_VOICES = {lang: tuple(model["voices"]) for lang, model in MODELS_DICT.items()}
 
-def get_supported_languages() -> List[str]:
+
+def get_supported_languages() -> Tuple[str, ...]:
     """
-    Returns a list of supported language codes.
+    Returns a tuple of supported language codes.
     This function can be called before creating a model instance.
     """
-    return list(MODELS_DICT.keys())
+    return _SUPPORTED_LANGS
 
 
-def get_available_voices(lang: str) -> List[str]:
+def get_available_voices(lang: str) -> Tuple[str, ...]:
     """
-    Returns a list of available voice IDs for a given language.
+    Returns a tuple of available voice IDs for a given language.
     This function can be called before creating a model instance.
 
     Args:
         lang (str): The language code (e.g., "en", "lug").
 
     Returns:
-        List[str]: A list of voice IDs.
+        Tuple[str, ...]: A tuple of voice IDs.
 
     Raises:
         ValueError: If the language is not supported.
     """
-    if lang not in MODELS_DICT:
+    if lang not in _LANG_SET:
         raise ValueError(
             f"Language '{lang}' is not supported. "
-            f"Supported languages are: {get_supported_languages()}"
+            f"Supported languages are: {list(_SUPPORTED_LANGS)}"
         )
-    return MODELS_DICT[lang]["voices"]
+    return _VOICES[lang]
 
 
 def get_default_male_voice(lang: str) -> str:
@@ -52,10 +60,10 @@ def get_default_male_voice(lang: str) -> str:
     Returns the default male voice ID for a given language.
     This function can be called before creating a model instance.
     """
-    if lang not in MODELS_DICT:
+    if lang not in _LANG_SET:
         raise ValueError(
             f"Language '{lang}' is not supported. "
-            f"Supported languages are: {get_supported_languages()}"
+            f"Supported languages are: {list(_SUPPORTED_LANGS)}"
         )
     return MODELS_DICT[lang]["default_male_voice"]
 
@@ -65,10 +73,10 @@ def get_default_female_voice(lang: str) -> str:
     Returns the default female voice ID for a given language.
     This function can be called before creating a model instance.
     """
-    if lang not in MODELS_DICT:
+    if lang not in _LANG_SET:
         raise ValueError(
             f"Language '{lang}' is not supported. "
-            f"Supported languages are: {get_supported_languages()}"
+            f"Supported languages are: {list(_SUPPORTED_LANGS)}"
         )
     return MODELS_DICT[lang]["default_female_voice"]
 
@@ -81,6 +89,48 @@ def save_wav(output_path: str, sample_rate: int, audio_data: NDArray[np.int16]):
         output_path (str): The path to save the .wav file.
         sample_rate (int): The audio sample rate (e.g., 24000).
         audio_data (NDArray[np.int16]): The audio data numpy array.
+
+    Raises:
+        TypeError: If the audio data is not int16.
+    """
+    if audio_data.dtype != np.int16:
+        raise TypeError(f"Expected int16 audio data, got {audio_data.dtype}.")
+    with wave.open(output_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.ascontiguousarray(audio_data))
+    print(f"Audio saved to {output_path}")
+
+
+def save_wav_stream(
+    output_path: str, audio_stream: Iterable[Tuple[int, NDArray[np.int16]]]
+) -> int:
+    """
+    Writes audio chunks to a .wav file as they are generated.
+
+    Each chunk is flushed to disk as soon as it arrives, so the full utterance
+    is never held in memory and writing overlaps with generation.
+
+    Args:
+        output_path (str): The path to save the .wav file.
+        audio_stream (Iterable[Tuple[int, NDArray[np.int16]]]): An iterable of
+            `(sample_rate, audio_chunk)` tuples, e.g. `OrpheusCpp.stream_tts_sync()`.
+
+    Returns:
+        int: The number of audio frames written.
     """
-    wavfile.write(output_path, sample_rate, audio_data.flatten())
-    print(f"Audio saved to {output_path}")
\ No newline at end of file
+    n_frames = 0
+    with wave.open(output_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(24_000)
+        for i, (sample_rate, chunk) in enumerate(audio_stream):
+            if i == 0:
+                wf.setframerate(sample_rate)
+            if chunk.dtype != np.int16:
+                raise TypeError(f"Expected int16 audio data, got {chunk.dtype}.")
+            wf.writeframesraw(np.ascontiguousarray(chunk))
+            n_frames += chunk.size
+    print(f"Audio saved to {output_path}")
+    return n_frames
@@ -13,6 +13,9 @@ MODELS_DICT = {
             "elizabeth"
         ],
         "repo_id" : "USOAL/Orpheous-Eng-GGUF",
+        "quant_variants" : {
+            "Q8_0" : "unsloth.Q8_0.gguf"
+        },
         "default_male_voice" : "christopher",
         "default_female_voice" : "barbara"
     }
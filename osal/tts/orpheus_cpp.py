@@ -1,12 +1,16 @@
 import asyncio
+import contextlib
+import math
 import platform
 import sys
 import threading
 from typing import (
     AsyncGenerator,
+    BinaryIO,
     Generator,
     Iterator,
     Literal,
+    Mapping,
     cast,
 )
 
@@ -16,14 +20,50 @@ from huggingface_hub import hf_hub_download
 from numpy.typing import NDArray
 from typing_extensions import NotRequired, TypedDict
 from .models import MODELS_DICT
-from .utils import TTSOptions
+from .utils import PROMPT_SUFFIX, TTSOptions, format_prompt, voice_prefix
 
 
 CUSTOM_TOKEN_PREFIX = "<custom_token_"
 
+# Number of samples the SNAC decoder yields per 7-token frame step.
+SNAC_CHUNK_SIZE = 2_048
+
+# KV cache precisions that llama.cpp can store on the CPU and GPU backends.
+# The quantized types require flash attention for the V cache.
+KV_CACHE_TYPES = ("f16", "q8_0", "q4_0")
+
+# Initial size of the reusable tts() output buffer: enough samples for the
+# default max_tokens of 2048 (one 2048-sample chunk per 7 tokens).
+OUTPUT_BUFFER_SIZE = 2_048 // 7 * SNAC_CHUNK_SIZE
+
+DEFAULT_OPTIONS = TTSOptions()
+
+
+def _resolve_options(options: TTSOptions | Mapping | None) -> TTSOptions:
+    """Returns `options` as TTSOptions, also accepting a plain dict of fields."""
+    if options is None:
+        return DEFAULT_OPTIONS
+    if isinstance(options, TTSOptions):
+        return options
+    return TTSOptions(**options)
+
 
 class OrpheusCpp:
 
+    __slots__ = (
+        "default_male_voice",
+        "default_female_voice",
+        "available_voices",
+        "_llm",
+        "_voice_prefix_ids",
+        "_suffix_ids",
+        "_lock",
+        "_lock_owner",
+        "_output_buffers",
+        "_snac_session",
+        "_snac_input_names",
+    )
+
     def __init__(
         self,
         huggingface_token: str,
@@ -31,6 +71,11 @@ class OrpheusCpp:
         n_threads: int = 0,
         verbose: bool = True,
         lang: Literal["en", "lug", "ach", "nyn", "teo"] = "en",
+        quantization: str = "Q8_0",
+        kv_cache_type: Literal["f16", "q8_0", "q4_0"] = "f16",
+        flash_attn: bool = False,
+        offload_kqv: bool = True,
+        use_mlock: bool = False,
     ):
         import importlib.util
 
@@ -58,17 +103,31 @@ class OrpheusCpp:
                 f"llama_cpp is not installed. Please install it using `pip install llama-cpp-python {extra_index_url}`."
             )
         repo_id = MODELS_DICT[lang]["repo_id"]
-        self.default_male_voice = MODELS_DICT[lang]["default_male_voice"]
-        self.default_female_voice = MODELS_DICT[lang]["default_female_voice"]
-        self.available_voices = MODELS_DICT[lang]["voices"]
-        
+        self._load_voices(lang)
+
+        quant_variants = MODELS_DICT[lang]["quant_variants"]
+        if quantization not in quant_variants:
+            raise ValueError(
+                f"Quantization '{quantization}' is not available for language '{lang}'. "
+                f"Available quantizations are: {list(quant_variants)}"
+            )
+
+        if kv_cache_type not in KV_CACHE_TYPES:
+            raise ValueError(
+                f"KV cache type '{kv_cache_type}' is not supported. "
+                f"Supported types are: {list(KV_CACHE_TYPES)}"
+            )
+
         model_file = hf_hub_download(
             repo_id=repo_id,
-            filename="unsloth.Q8_0.gguf",
+            filename=quant_variants[quantization],
             token=huggingface_token,
         )
+        import llama_cpp
         from llama_cpp import Llama
 
+        ggml_kv_type = getattr(llama_cpp, f"GGML_TYPE_{kv_cache_type.upper()}")
+
         if n_gpu_layers == 0:
             print(
                 "Running model without GPU Acceleration. Please set n_gpu_layers parameters to control the number of layers to offload to GPU."
@@ -81,19 +140,90 @@ class OrpheusCpp:
             n_gpu_layers=n_gpu_layers,
             n_threads=n_threads,
             batch_size=1,
+            type_k=ggml_kv_type,
+            type_v=ggml_kv_type,
+            flash_attn=flash_attn or kv_cache_type != "f16",
+            offload_kqv=offload_kqv,
+            use_mlock=use_mlock,
         )
 
+        self._init_prompt_cache()
+        self._init_thread_state()
+        self._load_snac(n_threads)
+
+    def _load_voices(self, lang: str) -> None:
+        self.default_male_voice = MODELS_DICT[lang]["default_male_voice"]
+        self.default_female_voice = MODELS_DICT[lang]["default_female_voice"]
+        self.available_voices = MODELS_DICT[lang]["voices"]
+
+    def _init_prompt_cache(self) -> None:
+        # Tokenize the constant parts of the prompt once, so each request
+        # only tokenizes its own text.
+        self._voice_prefix_ids = {
+            voice: self._tokenize(voice_prefix(voice), add_bos=True)
+            for voice in self.available_voices
+        }
+        self._suffix_ids = self._tokenize(PROMPT_SUFFIX)
+
+    def _init_thread_state(self) -> None:
+        # The model decodes one sequence at a time; serialize generations
+        # when the instance is shared between threads.
+        self._lock = threading.Lock()
+        self._lock_owner: int | None = None
+        self._output_buffers = threading.local()
+
+    @contextlib.contextmanager
+    def _generation(self) -> Iterator[None]:
+        """Holds the instance for one generation.
+
+        Other threads wait their turn. A generation started from the thread
+        that already holds the instance (e.g. calling `tts()` while iterating
+        an unfinished stream) raises instead of deadlocking.
+        """
+        if self._lock_owner == threading.get_ident():
+            raise RuntimeError(
+                "This model instance is already generating on this thread. "
+                "Finish or close() the open stream before starting another generation."
+            )
+        with self._lock:
+            self._lock_owner = threading.get_ident()
+            try:
+                yield
+            finally:
+                self._lock_owner = None
+
+    def _load_snac(self, n_threads: int = 0) -> None:
         repo_id = "onnx-community/snac_24khz-ONNX"
         snac_model_file = "decoder_model.onnx"
         snac_model_path = hf_hub_download(
             repo_id, subfolder="onnx", filename=snac_model_file
         )
 
-        # Load SNAC model with optimizations
+        # Load SNAC model with ONNX Runtime's default optimizations; the only
+        # change is giving it the same CPU thread budget as the language model
+        session_options = onnxruntime.SessionOptions()
+        if n_threads > 0:
+            session_options.intra_op_num_threads = n_threads
         self._snac_session = onnxruntime.InferenceSession(
             snac_model_path,
+            sess_options=session_options,
             providers=["CUDAExecutionProvider", "CPUExecutionProvider"],
         )
+        self._snac_input_names = [x.name for x in self._snac_session.get_inputs()]
+
+    def _tokenize(self, text: str, add_bos: bool = False) -> list[int]:
+        return self._llm.tokenize(text.encode("utf-8"), add_bos=add_bos, special=True)
+
+    def _prompt_ids(self, text: str, options: TTSOptions) -> list[int]:
+        default_voice = self.default_male_voice
+        return format_prompt(
+            text,
+            options.voice_id or default_voice,
+            self._voice_prefix_ids,
+            self._suffix_ids,
+            default_voice,
+            self._tokenize,
+        )
 
     def _token_to_id(self, token_text: str, index: int) -> int | None:
         token_string = token_text.strip()
@@ -142,65 +272,72 @@ class OrpheusCpp:
             return None
 
         num_frames = len(multiframe) // 7
-        frame = multiframe[: num_frames * 7]
-
-        # Initialize empty numpy arrays instead of torch tensors
-        codes_0 = np.array([], dtype=np.int32)
-        codes_1 = np.array([], dtype=np.int32)
-        codes_2 = np.array([], dtype=np.int32)
-
-        for j in range(num_frames):
-            i = 7 * j
-            # Append values to numpy arrays
-            codes_0 = np.append(codes_0, frame[i])
-
-            codes_1 = np.append(codes_1, [frame[i + 1], frame[i + 4]])
-
-            codes_2 = np.append(
-                codes_2, [frame[i + 2], frame[i + 3], frame[i + 5], frame[i + 6]]
-            )
-
-        # Reshape arrays to match the expected input format (add batch dimension)
-        codes_0 = np.expand_dims(codes_0, axis=0)
-        codes_1 = np.expand_dims(codes_1, axis=0)
-        codes_2 = np.expand_dims(codes_2, axis=0)
+        frame = np.array(multiframe[: num_frames * 7], dtype=np.int64).reshape(
+            num_frames, 7
+        )
 
         # Check that all tokens are between 0 and 4096
-        if (
-            np.any(codes_0 < 0)
-            or np.any(codes_0 > 4096)
-            or np.any(codes_1 < 0)
-            or np.any(codes_1 > 4096)
-            or np.any(codes_2 < 0)
-            or np.any(codes_2 > 4096)
-        ):
+        if np.any((frame < 0) | (frame > 4096)):
             return None
 
-        # Create input dictionary for ONNX session
-
-        snac_input_names = [x.name for x in self._snac_session.get_inputs()]
+        # Split each 7-token frame into the three SNAC codebooks, laid out
+        # frame by frame, and add the batch dimension
+        codes_0 = frame[:, 0].reshape(1, -1)
+        codes_1 = frame[:, [1, 4]].reshape(1, -1)
+        codes_2 = frame[:, [2, 3, 5, 6]].reshape(1, -1)
 
-        input_dict = dict(zip(snac_input_names, [codes_0, codes_1, codes_2]))
+        # Create input dictionary for ONNX session
+        input_dict = dict(zip(self._snac_input_names, [codes_0, codes_1, codes_2]))
 
         # Run inference
         audio_hat = self._snac_session.run(None, input_dict)[0]
 
-        # Process output
-        audio_np = audio_hat[:, :, 2048:4096]
-        audio_int16 = (audio_np * 32767).astype(np.int16)
-        audio_bytes = audio_int16.tobytes()
-        return audio_bytes
+        # Process output: scale and clip in place in the decoder output, which
+        # is not reused, then cast once. Samples outside [-1, 1] saturate
+        # instead of wrapping around when cast to int16.
+        audio_np = audio_hat[0, :, SNAC_CHUNK_SIZE : 2 * SNAC_CHUNK_SIZE]
+        np.multiply(audio_np, 32767, out=audio_np)
+        np.clip(audio_np, -32768, 32767, out=audio_np)
+        return audio_np.astype(np.int16)
+
+    def _output_buffer(self, min_size: int, keep: int) -> NDArray[np.int16]:
+        """Returns this thread's reusable output buffer, grown to `min_size` samples."""
+        buffer = getattr(self._output_buffers, "buffer", None)
+        if buffer is None or buffer.shape[1] < min_size:
+            size = max(min_size, OUTPUT_BUFFER_SIZE if buffer is None else 2 * buffer.shape[1])
+            grown = np.empty((1, size), dtype=np.int16)
+            if buffer is not None:
+                grown[:, :keep] = buffer[:, :keep]
+            buffer = self._output_buffers.buffer = grown
+        return buffer
 
     def tts(
-        self, text: str, options: TTSOptions | None = None
+        self, text: str, options: TTSOptions | Mapping | None = None, copy: bool = True
     ) -> tuple[int, NDArray[np.int16]]:
-        buffer = []
+        """Synthesizes the whole text and returns the audio.
+
+        With `copy=False` the audio is assembled in a buffer that is reused
+        across calls from the same thread, and the returned array is a view of
+        that buffer. This avoids allocating a new array per call, but the view
+        is overwritten by the next `tts(copy=False)` call on the same thread;
+        take a `.copy()` if the audio must outlive it.
+        """
+        if copy:
+            buffer = [array for _, array in self.stream_tts_sync(text, options)]
+            return (24_000, np.concatenate(buffer, axis=1))
+
+        n_samples = 0
+        buffer = self._output_buffer(0, 0)
         for _, array in self.stream_tts_sync(text, options):
-            buffer.append(array)
-        return (24_000, np.concatenate(buffer, axis=1))
+            end = n_samples + array.shape[1]
+            if end > buffer.shape[1]:
+                buffer = self._output_buffer(end, n_samples)
+            buffer[:, n_samples:end] = array
+            n_samples = end
+        return (24_000, buffer[:, :n_samples])
 
     async def stream_tts(
-        self, text: str, options: TTSOptions | None = None
+        self, text: str, options: TTSOptions | Mapping | None = None
     ) -> AsyncGenerator[tuple[int, NDArray[np.float32]], None]:
         queue = asyncio.Queue()
         finished = asyncio.Event()
@@ -224,41 +361,68 @@ class OrpheusCpp:
             yield chunk
 
     def _token_gen(
-        self, text: str, options: TTSOptions | None = None
+        self, text: str, options: TTSOptions | Mapping | None = None
     ) -> Generator[str, None, None]:
         from llama_cpp import CreateCompletionStreamResponse
 
-        options = options or TTSOptions()
-        voice_id = options.get("voice_id", self.default_male_voice)
-        text = f"<|audio|>{voice_id}: {text}<|eot_id|><custom_token_4>"
-        token_gen = self._llm(
-            text,
-            max_tokens=options.get("max_tokens", 2_048),
-            stream=True,
-            temperature=options.get("temperature", 0.8),
-            top_p=options.get("top_p", 0.95),
-            top_k=options.get("top_k", 40),
-            min_p=options.get("min_p", 0.05),
-        )
-        for token in cast(Iterator[CreateCompletionStreamResponse], token_gen):
-            yield token["choices"][0]["text"]
+        options = _resolve_options(options)
+        prompt = self._prompt_ids(text, options)
+        with self._generation():
+            token_gen = self._llm(
+                prompt,
+                max_tokens=options.max_tokens,
+                stream=True,
+                temperature=options.temperature,
+                top_p=options.top_p,
+                top_k=options.top_k,
+                min_p=options.min_p,
+            )
+            for token in cast(Iterator[CreateCompletionStreamResponse], token_gen):
+                yield token["choices"][0]["text"]
 
     def stream_tts_sync(
-        self, text: str, options: TTSOptions | None = None
+        self, text: str, options: TTSOptions | Mapping | None = None
     ) -> Generator[tuple[int, NDArray[np.int16]], None, None]:
-        options = options or TTSOptions()
+        options = _resolve_options(options)
+        if options.pre_buffer_size < 0:
+            raise ValueError(
+                f"pre_buffer_size must be non-negative, got {options.pre_buffer_size}."
+            )
         token_gen = self._token_gen(text, options)
-        pre_buffer = np.array([], dtype=np.int16).reshape(1, 0)
-        pre_buffer_size = 24_000 * options.get("pre_buffer_size", 1.5)
+        pre_buffer_size = math.ceil(24_000 * options.pre_buffer_size)
+        # Allocated once with room for one chunk past the threshold, so the
+        # pre-buffer is filled in place instead of re-concatenated per chunk
+        pre_buffer = np.empty((1, pre_buffer_size + SNAC_CHUNK_SIZE), dtype=np.int16)
+        n_buffered = 0
         started_playback = False
-        for audio_bytes in self._decode(token_gen):
-            audio_array = np.frombuffer(audio_bytes, dtype=np.int16).reshape(1, -1)
+        for audio_array in self._decode(token_gen):
             if not started_playback:
-                pre_buffer = np.concatenate([pre_buffer, audio_array], axis=1)
-                if pre_buffer.shape[1] >= pre_buffer_size:
+                end = n_buffered + audio_array.shape[1]
+                pre_buffer[:, n_buffered:end] = audio_array
+                n_buffered = end
+                if n_buffered >= pre_buffer_size:
                     started_playback = True
-                    yield (24_000, pre_buffer)
+                    yield (24_000, pre_buffer[:, :n_buffered])
             else:
                 yield (24_000, audio_array)
         if not started_playback:
-            yield (24_000, pre_buffer)
\ No newline at end of file
+            yield (24_000, pre_buffer[:, :n_buffered])
+
+    def stream_pcm(
+        self,
+        text: str,
+        options: TTSOptions | Mapping | None = None,
+        sink: BinaryIO | None = None,
+    ) -> Generator[memoryview, None, None]:
+        """Streams the audio as raw 24 kHz mono 16-bit PCM in native byte order.
+
+        Each chunk is a memoryview over the generated samples, so it can be
+        handed to a socket, file or encoder without an intermediate
+        `.tobytes()` copy. If `sink` is given, every chunk is also written to
+        it as it is generated.
+        """
+        for _, array in self.stream_tts_sync(text, options):
+            pcm = memoryview(array.reshape(-1)).cast("B")
+            if sink is not None:
+                sink.write(pcm)
+            yield pcm
@@ -0,0 +1,72 @@
+import importlib.util
+from typing import Generator, Literal, Mapping
+
+from .orpheus_cpp import OrpheusCpp, _resolve_options
+from .utils import TTSOptions
+
+
+class OrpheusCT2(OrpheusCpp):
+    """Orpheus TTS running the language model on CTranslate2 instead of llama.cpp.
+
+    Prompt formatting, sampling options, SNAC decoding and streaming are
+    shared with `OrpheusCpp`; only the transformer inference engine differs.
+    CTranslate2's int8 kernels are usually faster than GGUF on CPU-only
+    deployments.
+
+    The model must first be converted to the CTranslate2 format, keeping the
+    tokenizer files next to it:
+
+        ct2-transformers-converter --model <orpheus-hf-checkpoint> \\
+            --quantization int8 --output_dir orpheus-ct2 \\
+            --copy_files tokenizer.json tokenizer_config.json special_tokens_map.json
+    """
+
+    __slots__ = ("_generator", "_tokenizer")
+
+    def __init__(
+        self,
+        model_path: str,
+        lang: Literal["en", "lug", "ach", "nyn", "teo"] = "en",
+        device: Literal["cpu", "cuda", "auto"] = "cpu",
+        compute_type: str = "int8",
+        n_threads: int = 0,
+    ):
+        if importlib.util.find_spec("ctranslate2") is None:
+            raise ImportError(
+                "ctranslate2 is not installed. Please install it using `pip install osal[ct2]`."
+            )
+        import ctranslate2
+        from transformers import AutoTokenizer
+
+        self._load_voices(lang)
+
+        self._generator = ctranslate2.Generator(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            intra_threads=n_threads,
+        )
+        self._tokenizer = AutoTokenizer.from_pretrained(model_path)
+
+        self._init_prompt_cache()
+        self._init_thread_state()
+        self._load_snac(n_threads)
+
+    def _tokenize(self, text: str, add_bos: bool = False) -> list[int]:
+        return self._tokenizer.encode(text, add_special_tokens=add_bos)
+
+    def _token_gen(
+        self, text: str, options: TTSOptions | Mapping | None = None
+    ) -> Generator[str, None, None]:
+        options = _resolve_options(options)
+        prompt = self._tokenizer.convert_ids_to_tokens(self._prompt_ids(text, options))
+        # CTranslate2 has no min-p sampling; min_p is ignored on this backend.
+        with self._generation():
+            for step in self._generator.generate_tokens(
+                prompt,
+                max_length=options.max_tokens,
+                sampling_temperature=options.temperature,
+                sampling_topk=options.top_k,
+                sampling_topp=options.top_p,
+            ):
+                yield step.token
@@ -1,5 +1,9 @@
 from .options import TTSOptions
+from .format_input import PROMPT_SUFFIX, format_prompt, voice_prefix
 
 __all__ = [
     "TTSOptions",
+    "PROMPT_SUFFIX",
+    "format_prompt",
+    "voice_prefix",
 ]
\ No newline at end of file
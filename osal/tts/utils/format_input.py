@@ -0,0 +1,33 @@
+from typing import Callable, List, Mapping, Sequence
+
+AUDIO_START_TOKEN = "<|audio|>"
+AUDIO_END_TOKEN = "<|eot_id|>"
+GENERATION_START_TOKEN = "<custom_token_4>"
+
+PROMPT_SUFFIX = f"{AUDIO_END_TOKEN}{GENERATION_START_TOKEN}"
+
+
+def voice_prefix(voice: str) -> str:
+    """Returns the constant part of the prompt that precedes the text for a voice."""
+    return f"{AUDIO_START_TOKEN}{voice}:"
+
+
+def format_prompt(
+    prompt: str,
+    voice: str,
+    voice_prefix_ids: Mapping[str, Sequence[int]],
+    suffix_ids: Sequence[int],
+    default_voice: str,
+    tokenize: Callable[[str], Sequence[int]],
+) -> List[int]:
+    """Builds the token ids of the Orpheus prompt for the given voice.
+
+    Only the text itself is tokenized; the voice prefix and the suffix are
+    looked up from ids tokenized once by the model. Unknown voices fall back
+    to `default_voice`.
+    """
+    prefix_ids = voice_prefix_ids.get(voice)
+    if prefix_ids is None:
+        prefix_ids = voice_prefix_ids[default_voice]
+    # The leading space keeps the text split exactly as it is after "voice:".
+    return [*prefix_ids, *tokenize(f" {prompt}"), *suffix_ids]
@@ -1,19 +1,20 @@
 
-from typing import TypedDict, NotRequired
+from dataclasses import dataclass
 
-class TTSOptions(TypedDict):
-    max_tokens: NotRequired[int]
+@dataclass(slots=True, frozen=True)
+class TTSOptions:
+    voice_id: str | None = None
+    """Voice ID to use for TTS. Default: the model's default male voice"""
+    max_tokens: int = 2048
     """Maximum number of tokens to generate. Default: 2048"""
-    temperature: NotRequired[float]
+    temperature: float = 0.8
     """Temperature for top-p sampling. Default: 0.8"""
-    top_p: NotRequired[float]
+    top_p: float = 0.95
     """Top-p sampling. Default: 0.95"""
-    top_k: NotRequired[int]
+    top_k: int = 40
     """Top-k sampling. Default: 40"""
-    min_p: NotRequired[float]
+    min_p: float = 0.05
     """Minimum probability for top-p sampling. Default: 0.05"""
-    pre_buffer_size: NotRequired[float]
+    pre_buffer_size: float = 1.5
     """Seconds of audio to generate before yielding the first chunk. Smoother audio streaming at the cost of higher time to wait for the first chunk."""
-    voiqce_id: NotRequired[str]
-    """Voice ID to use for TTS."""
 
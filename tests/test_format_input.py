@@ -0,0 +1,26 @@
+import unittest
+from osal.tts.utils import format_prompt, voice_prefix
+
+
+def fake_tokenize(text):
+    return [ord(c) for c in text]
+
+
+class TestFormatPrompt(unittest.TestCase):
+    def setUp(self):
+        self.voice_prefix_ids = {"tara": [1, 2], "leo": [3, 4]}
+        self.suffix_ids = [9]
+
+    def test_known_voice(self):
+        ids = format_prompt("hi", "leo", self.voice_prefix_ids, self.suffix_ids, "tara", fake_tokenize)
+        self.assertEqual(ids, [3, 4, ord(" "), ord("h"), ord("i"), 9])
+
+    def test_unknown_voice_falls_back_to_default(self):
+        ids = format_prompt("hi", "nobody", self.voice_prefix_ids, self.suffix_ids, "tara", fake_tokenize)
+        self.assertEqual(ids[:2], [1, 2])
+
+    def test_voice_prefix(self):
+        self.assertEqual(voice_prefix("tara"), "<|audio|>tara:")
+
+if __name__ == '__main__':
+    unittest.main()
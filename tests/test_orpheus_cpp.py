@@ -0,0 +1,218 @@
+import io
+import threading
+import time
+import unittest
+
+import numpy as np
+from osal.tts import OrpheusCpp, TTSOptions
+from osal.tts.orpheus_cpp import OUTPUT_BUFFER_SIZE
+
+
+class FakeSnacSession:
+    def __init__(self):
+        self.inputs = None
+
+    def run(self, output_names, input_dict):
+        self.inputs = input_dict
+        audio = np.full((1, 1, 4096), 0.5, dtype=np.float32)
+        # Out-of-range samples inside the 2048:4096 window that is kept
+        audio[0, 0, 2048:2050] = [2.0, -2.0]
+        return [audio]
+
+
+def make_model():
+    model = object.__new__(OrpheusCpp)
+    model._snac_session = FakeSnacSession()
+    model._snac_input_names = ["codes_0", "codes_1", "codes_2"]
+    return model
+
+
+def split_codes_reference(multiframe):
+    # Per-frame interleave used before the vectorized split
+    codes_0, codes_1, codes_2 = [], [], []
+    for j in range(len(multiframe) // 7):
+        i = 7 * j
+        codes_0.append(multiframe[i])
+        codes_1.extend([multiframe[i + 1], multiframe[i + 4]])
+        codes_2.extend([multiframe[i + 2], multiframe[i + 3], multiframe[i + 5], multiframe[i + 6]])
+    return codes_0, codes_1, codes_2
+
+
+class TestConvertToAudio(unittest.TestCase):
+    def test_codebook_split_matches_frame_interleave(self):
+        model = make_model()
+        multiframe = list(range(1, 29))
+        audio = model._convert_to_audio(multiframe)
+
+        inputs = model._snac_session.inputs
+        for name, expected in zip(model._snac_input_names, split_codes_reference(multiframe)):
+            self.assertEqual(inputs[name].shape, (1, len(expected)))
+            self.assertEqual(inputs[name][0].tolist(), expected)
+        self.assertEqual(audio.dtype, np.int16)
+        self.assertEqual(audio.shape, (1, 2048))
+
+    def test_out_of_range_samples_saturate(self):
+        model = make_model()
+        audio = model._convert_to_audio(list(range(1, 29)))
+        self.assertEqual(audio[0, :2].tolist(), [32767, -32768])
+        self.assertTrue(np.all(audio[0, 2:] == 16383))
+
+    def test_out_of_range_codes_return_none(self):
+        for bad in (-1, 4097):
+            model = make_model()
+            multiframe = list(range(1, 29))
+            multiframe[12] = bad
+            self.assertIsNone(model._convert_to_audio(multiframe))
+            self.assertIsNone(model._snac_session.inputs)
+
+
+class StubStreamModel(OrpheusCpp):
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self._output_buffers = threading.local()
+
+    def stream_tts_sync(self, text, options=None):
+        for chunk in self.chunks:
+            yield (24_000, chunk)
+
+
+def make_chunks(sizes):
+    start = 0
+    chunks = []
+    for size in sizes:
+        chunks.append((np.arange(start, start + size) % 30_000).astype(np.int16).reshape(1, -1))
+        start += size
+    return chunks
+
+
+class TestTTSBuffer(unittest.TestCase):
+    def test_output_buffer_growth_keeps_prefix(self):
+        model = StubStreamModel([])
+        buffer = model._output_buffer(0, 0)
+        buffer[0, :10] = np.arange(10)
+        grown = model._output_buffer(buffer.shape[1] + 1, 10)
+        self.assertGreater(grown.shape[1], buffer.shape[1])
+        self.assertEqual(grown[0, :10].tolist(), list(range(10)))
+        self.assertIs(model._output_buffer(0, 0), grown)
+
+    def test_copy_returns_owned_array(self):
+        chunks = make_chunks([2048, 2048, 1000])
+        model = StubStreamModel(chunks)
+        sample_rate, audio = model.tts("text")
+        self.assertEqual(sample_rate, 24_000)
+        np.testing.assert_array_equal(audio, np.concatenate(chunks, axis=1))
+        self.assertIsNone(getattr(model._output_buffers, "buffer", None))
+
+    def test_no_copy_reuses_and_grows_buffer(self):
+        chunks = make_chunks([OUTPUT_BUFFER_SIZE - 100, 2048, 2048])
+        model = StubStreamModel(chunks)
+        _, audio = model.tts("text", copy=False)
+        np.testing.assert_array_equal(audio, np.concatenate(chunks, axis=1))
+        self.assertIs(audio.base, model._output_buffers.buffer)
+
+
+class StubDecodeModel(OrpheusCpp):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def _token_gen(self, text, options=None):
+        return iter(())
+
+    def _decode(self, token_gen):
+        yield from self.chunks
+
+
+class TestStreamPreBuffer(unittest.TestCase):
+    def stream(self, sizes, pre_buffer_size):
+        chunks = make_chunks(sizes)
+        model = StubDecodeModel(chunks)
+        options = TTSOptions(pre_buffer_size=pre_buffer_size)
+        return chunks, [array for _, array in model.stream_tts_sync("text", options)]
+
+    def test_threshold_reached_mid_stream(self):
+        # 0.1 s at 24 kHz is 2400 samples: reached by the second chunk
+        chunks, out = self.stream([2048, 2048, 2048, 1000], 0.1)
+        self.assertEqual([a.shape[1] for a in out], [4096, 2048, 1000])
+        np.testing.assert_array_equal(out[0], np.concatenate(chunks[:2], axis=1))
+        np.testing.assert_array_equal(np.concatenate(out, axis=1), np.concatenate(chunks, axis=1))
+
+    def test_stream_ends_before_threshold(self):
+        chunks, out = self.stream([2048, 1000], 1.5)
+        self.assertEqual(len(out), 1)
+        np.testing.assert_array_equal(out[0], np.concatenate(chunks, axis=1))
+
+    def test_zero_pre_buffer_yields_every_chunk(self):
+        chunks, out = self.stream([2048, 2048, 500], 0)
+        self.assertEqual(len(out), 3)
+        for got, expected in zip(out, chunks):
+            np.testing.assert_array_equal(got, expected)
+
+    def test_negative_pre_buffer_raises(self):
+        with self.assertRaises(ValueError):
+            self.stream([2048], -1)
+
+
+class StubGenerationModel(OrpheusCpp):
+    """Generates through the real instance lock, recording which thread ran each token."""
+
+    def __init__(self, n_tokens=3, delay=0.0):
+        self.n_tokens = n_tokens
+        self.delay = delay
+        self.owners = []
+        self._init_thread_state()
+
+    def _token_gen(self, text, options=None):
+        with self._generation():
+            for i in range(self.n_tokens):
+                self.owners.append(threading.get_ident())
+                time.sleep(self.delay)
+                yield f"<custom_token_{i}>"
+
+    def _decode(self, token_gen):
+        for _ in token_gen:
+            yield np.zeros((1, 10), dtype=np.int16)
+
+
+class TestGenerationLock(unittest.TestCase):
+    def test_concurrent_threads_run_one_after_another(self):
+        model = StubGenerationModel(n_tokens=5, delay=0.01)
+        threads = [threading.Thread(target=model.tts, args=("text",)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        owners = model.owners
+        self.assertEqual(len(owners), 10)
+        self.assertEqual(len(set(owners[:5])), 1)
+        self.assertEqual(len(set(owners[5:])), 1)
+        self.assertNotEqual(owners[0], owners[5])
+
+    def test_same_thread_reentry_raises(self):
+        model = StubGenerationModel()
+        stream = model.stream_tts_sync("first", TTSOptions(pre_buffer_size=0))
+        next(stream)
+        with self.assertRaises(RuntimeError):
+            model.tts("second")
+        stream.close()
+        _, audio = model.tts("third")
+        self.assertEqual(audio.shape, (1, 30))
+
+
+class TestStreamPcm(unittest.TestCase):
+    def test_views_match_chunks_and_sink(self):
+        chunks = make_chunks([2048, 2048, 2048, 1000])
+        model = StubDecodeModel(chunks)
+        sink = io.BytesIO()
+        # 0.1 s pre-buffer: the first view is a slice of the pre-buffer
+        views = list(model.stream_pcm("text", TTSOptions(pre_buffer_size=0.1), sink=sink))
+
+        expected = np.concatenate(chunks, axis=1).astype("=i2").tobytes()
+        self.assertEqual(len(views), 3)
+        self.assertTrue(all(isinstance(view, memoryview) for view in views))
+        self.assertEqual(b"".join(views), expected)
+        self.assertEqual(sink.getvalue(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from types import SimpleNamespace
+
+from osal.tts import OrpheusCT2, TTSOptions
+
+
+class StubTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return ([0] if add_special_tokens else []) + [ord(c) for c in text]
+
+    def convert_ids_to_tokens(self, ids):
+        return [str(i) for i in ids]
+
+
+class StubGenerator:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.calls = []
+
+    def generate_tokens(self, prompt, **kwargs):
+        self.calls.append((prompt, kwargs))
+        for token in self.tokens:
+            yield SimpleNamespace(token=token)
+
+
+def make_model(tokens):
+    model = object.__new__(OrpheusCT2)
+    model.default_male_voice = "tara"
+    model.available_voices = ["tara"]
+    model._tokenizer = StubTokenizer()
+    model._generator = StubGenerator(tokens)
+    model._init_prompt_cache()
+    model._init_thread_state()
+    return model
+
+
+class TestOrpheusCT2TokenGen(unittest.TestCase):
+    def test_passes_sampling_options_and_yields_tokens(self):
+        tokens = ["<custom_token_10>", "<custom_token_11>"]
+        model = make_model(tokens)
+        options = TTSOptions(max_tokens=100, temperature=0.6, top_k=20, top_p=0.9)
+
+        self.assertEqual(list(model._token_gen("hi", options)), tokens)
+
+        ((prompt, kwargs),) = model._generator.calls
+        self.assertEqual(prompt, [str(i) for i in model._prompt_ids("hi", options)])
+        self.assertEqual(
+            kwargs,
+            {
+                "max_length": 100,
+                "sampling_temperature": 0.6,
+                "sampling_topk": 20,
+                "sampling_topp": 0.9,
+            },
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+from osal import tts
+
+
+class TestSaveWav(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "out.wav")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assertWavEquals(self, sample_rate, samples):
+        with wave.open(self.path, "rb") as wf:
+            self.assertEqual(wf.getnchannels(), 1)
+            self.assertEqual(wf.getsampwidth(), 2)
+            self.assertEqual(wf.getframerate(), sample_rate)
+            self.assertEqual(wf.getnframes(), samples.size)
+            frames = wf.readframes(wf.getnframes())
+        self.assertEqual(frames, samples.astype("<i2").tobytes())
+
+    def test_save_wav_2d_input(self):
+        audio = np.arange(-500, 500, dtype=np.int16).reshape(1, -1)
+        tts.save_wav(self.path, 24_000, audio)
+        self.assertWavEquals(24_000, audio.ravel())
+
+    def test_save_wav_rejects_non_int16(self):
+        with self.assertRaises(TypeError):
+            tts.save_wav(self.path, 24_000, np.zeros((1, 10), dtype=np.float32))
+
+    def test_save_wav_stream(self):
+        chunks = [
+            np.arange(0, 100, dtype=np.int16).reshape(1, -1),
+            np.arange(-100, 0, dtype=np.int16).reshape(1, -1),
+        ]
+        n_frames = tts.save_wav_stream(self.path, ((16_000, chunk) for chunk in chunks))
+        self.assertEqual(n_frames, 200)
+        self.assertWavEquals(16_000, np.concatenate(chunks, axis=1).ravel())
+
+    def test_save_wav_stream_rejects_non_int16(self):
+        with self.assertRaises(TypeError):
+            tts.save_wav_stream(self.path, [(24_000, np.zeros((1, 10), dtype=np.int32))])
+
+if __name__ == '__main__':
+    unittest.main()